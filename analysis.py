@@ -3,6 +3,12 @@ import numpy as np
 import os
 import logging
 import traceback
+import hashlib
+import json
+import datetime
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # ── Logger setup ──────────────────────────────────────────────
 LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
@@ -21,39 +27,87 @@ log = logging.getLogger('data_analyser')
 # ── High-cardinality threshold (for STRING columns only) ──────
 STRING_CARDINALITY_THRESHOLD = 0.85
 
+# ── Parallel per-column analysis (below this, run serially) ───
+PARALLEL_MIN_COLUMNS = 4
+PARALLEL_BACKEND = "threads"   # "threads" (shared DataFrame, no pickling) or "processes"
+
+# ── Chunked streaming for large CSV/TSV files ─────────────────
+STREAM_MIN_BYTES = 50 * 1024 * 1024   # smaller files are read fully in memory
+CHUNK = 200_000                       # rows per read_csv chunk
+STREAM_SAMPLE_ROWS = 100_000          # uniform row sample kept for charts/quartiles
+MAX_TRACKED_VALUES = 10_000           # stop exact value counting past this many distinct values
+ENCODING_PROBE_BYTES = 64 * 1024      # head of a CSV decoded to pick the encoding
+
+# ── On-disk result cache (re-uploads of the same file) ────────
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+CACHE_MIN_BYTES = 1024 * 1024   # below this, re-analysing is cheaper than caching
+CACHE_VERSION = 4               # bump when the result format/logic changes
+CACHE_MAX_ENTRIES = 200         # least recently used entries beyond this are deleted
+
+# ── Very large Excel workbooks are read up to a row cap ───────
+EXCEL_NROWS_MIN_BYTES = 100 * 1024 * 1024
+EXCEL_MAX_ROWS = 1_000_000
+
+# ── Row sampling for tall in-memory files ─────────────────────
+SAMPLE_THRESHOLD = 200_000   # above this many rows, histograms are binned from a sample
+SAMPLE_ROWS = 100_000
+
+# ── Small-range integer columns are counted, not sorted ───────
+INT_HIST_MAX_RANGE = 1024       # histogram bins via np.bincount
+INT_COUNT_MAX_RANGE = 2 ** 20   # quartiles/median/unique via np.bincount
+
 
 # ──────────────────────────────────────────────────────────────
 #  COLUMN CLASSIFICATION
 # ──────────────────────────────────────────────────────────────
-def classify_column(series: pd.Series, col_name: str, total_rows: int) -> str:
+def classify_column(clean: pd.Series, col_name: str, total_rows: int,
+                    clean_num: pd.Series, unique: int = None, summary: dict = None) -> str:
     """
     Classify into: Numerical, String, Date, or Skipped.
     Skipped = identifier columns (sequential integer IDs or high-cardinality strings).
     No mixed type category.
 
+    clean is the column's non-null values and clean_num the column coerced
+    with coerce_numeric() with NaNs removed — both computed once per column
+    by _analyse_one_column from a single NaN mask. unique (optional) is the
+    distinct-value count the caller already has; counted here if omitted.
+    summary (streamed files only) holds the column's exact whole-file figures.
+
     IMPORTANT: Continuous numerical data (salary, scores, etc.) is NEVER skipped.
     Only sequential integer IDs are skipped among numerical columns.
     """
-    clean = series.dropna()
     if clean.empty:
         log.debug(f"  [{col_name}] all NaN → String")
         return "String"
 
-    unique = clean.nunique()
-    ratio = unique / total_rows if total_rows > 0 else 0
+    # ── dtype fast paths ──────────────────────────────────────
+    if pd.api.types.is_datetime64_any_dtype(clean):
+        log.debug(f"  [{col_name}] datetime dtype → Date")
+        return "Date"
+    if pd.api.types.is_bool_dtype(clean):
+        log.debug(f"  [{col_name}] bool dtype → String")
+        return "String"
+    numeric_dtype = pd.api.types.is_numeric_dtype(clean)
 
     # ── Check if date ─────────────────────────────────────────
-    if _is_date_column(clean, col_name):
-        log.debug(f"  [{col_name}] detected as Date (unique={unique})")
+    # Typed numbers only get the sample parse when the name hints at a date
+    # (e.g. 20240131 ints) — otherwise IDs like 1001, 1002 parse as years.
+    if (not numeric_dtype or _has_date_hint(col_name)) and _is_date_column(clean, col_name):
+        log.debug(f"  [{col_name}] detected as Date")
         return "Date"
 
+    # Counted only once the dtype/date dispatch could not decide
+    if unique is None:
+        unique = clean.nunique()
+    ratio = unique / total_rows if total_rows > 0 else 0
+
     # ── Check if numeric ──────────────────────────────────────
-    numeric_vals = pd.to_numeric(clean, errors='coerce')
-    num_ratio = numeric_vals.notna().sum() / len(clean)
+    # Numeric dtype coerces 1:1, so the ratio is known without counting
+    num_ratio = 1.0 if numeric_dtype else len(clean_num) / len(clean)
 
     if num_ratio >= 0.8:
         # Only skip if it looks like a sequential integer ID
-        if _is_sequential_id(numeric_vals.dropna(), col_name, ratio, unique):
+        if _is_sequential_id(clean_num, col_name, ratio, unique, summary):
             log.debug(f"  [{col_name}] Sequential integer ID → Skipped")
             return "Skipped"
         log.debug(f"  [{col_name}] → Numerical (num_ratio={num_ratio:.2%}, unique={unique})")
@@ -68,8 +122,26 @@ def classify_column(series: pd.Series, col_name: str, total_rows: int) -> str:
     return "String"
 
 
+def coerce_numeric(series: pd.Series) -> pd.Series:
+    """
+    pd.to_numeric(series, errors='coerce'), but for text columns each distinct
+    string is parsed once and the result broadcast back via factorize codes.
+    Categorical-like text (a handful of distinct values) skips N float parses.
+    """
+    if series.dtype == object or isinstance(series.dtype, pd.StringDtype):
+        try:
+            codes, uniques = pd.factorize(series)
+            parsed = pd.to_numeric(pd.Series(uniques, dtype=object), errors='coerce')
+            # Trailing NaN sentinel: code -1 (null) indexes it, even when all-null
+            parsed = np.append(parsed.to_numpy(dtype=float, na_value=np.nan), np.nan)
+            return pd.Series(parsed[codes], index=series.index)
+        except TypeError:
+            pass  # unhashable values — fall through to the plain path
+    return pd.to_numeric(series, errors='coerce')
+
+
 def _is_sequential_id(numeric_clean: pd.Series, col_name: str,
-                       ratio: float, unique: int) -> bool:
+                       ratio: float, unique: int, summary: dict = None) -> bool:
     """
     Detect sequential integer IDs (e.g. Employee_ID = 1,2,3,...5000).
     Must satisfy ALL of:
@@ -77,13 +149,18 @@ def _is_sequential_id(numeric_clean: pd.Series, col_name: str,
       2. All values are integers (no decimals)
       3. Values look sequential: sorted diffs are mostly 1, or
          column name contains 'id'/'key'/'index'/'code'/'no'/'num'
+    For streamed files numeric_clean is a random row sample, whose sorted
+    diffs are not uniform; the step test then uses the exact whole-file
+    summary instead (n values spanning max - min on an integer step).
     """
     if ratio < 0.95 or unique <= 100:
         return False
 
-    # Must be all-integer (no fractional parts)
-    if not all(v == int(v) for v in numeric_clean.head(200)):
-        return False
+    # Must be all-integer (no fractional parts) — integer dtypes trivially are
+    if numeric_clean.dtype.kind not in ('i', 'u'):
+        head200 = numeric_clean.head(200).to_numpy(dtype=float)
+        if not np.all(np.isfinite(head200)) or not np.all(np.floor(head200) == head200):
+            return False
 
     # Column name hints
     id_hints = ['_id', 'id_', 'key', 'index', 'idx', 'code', '_no', '_num',
@@ -93,14 +170,35 @@ def _is_sequential_id(numeric_clean: pd.Series, col_name: str,
         log.debug(f"  [{col_name}] Name matches ID pattern")
         return True
 
+    if summary is not None:
+        n = summary["n"]
+        step = (summary["max"] - summary["min"]) / (n - 1) if n > 1 else 0.0
+        if step >= 1 and float(step).is_integer():
+            log.debug(f"  [{col_name}] Sequential range detected (step={step}, n={n})")
+            return True
+        return False
+
     # Check if sequential: sort and look at diffs
     try:
-        sorted_vals = numeric_clean.sort_values().values
+        sorted_vals = np.sort(numeric_clean.to_numpy(dtype=float))
         diffs = np.diff(sorted_vals)
         if len(diffs) > 0:
             # Sequential if most diffs are equal (constant step like 1,2,3...)
-            most_common_diff = pd.Series(diffs).mode().iloc[0] if len(diffs) > 0 else 0
-            sequential_pct = (diffs == most_common_diff).sum() / len(diffs)
+            if np.all(diffs == diffs[0]):
+                # Perfectly uniform step — no mode computation needed
+                most_common_diff, sequential_pct = diffs[0], 1.0
+            else:
+                # Mode of the step: counting sweep for small integer steps,
+                # sort-based np.unique otherwise (ties → smallest, like Series.mode)
+                if np.all(np.isfinite(diffs)) and diffs.max() <= 1_000_000 and np.all(np.floor(diffs) == diffs):
+                    counts = np.bincount(diffs.astype(np.int64))
+                    most_common_diff = float(np.argmax(counts))
+                    top = counts.max()
+                else:
+                    steps, counts = np.unique(diffs, return_counts=True)
+                    most_common_diff = steps[np.argmax(counts)]
+                    top = counts.max()
+                sequential_pct = top / len(diffs)
             if sequential_pct > 0.90 and most_common_diff > 0:
                 log.debug(f"  [{col_name}] Sequential pattern detected (step={most_common_diff}, {sequential_pct:.0%} consistent)")
                 return True
@@ -110,6 +208,14 @@ def _is_sequential_id(numeric_clean: pd.Series, col_name: str,
     return False
 
 
+def _has_date_hint(col_name: str) -> bool:
+    """Column name suggests a date/time field."""
+    date_hints = ['date', 'time', 'timestamp', 'created', 'updated', 'dt',
+                  'dob', 'birth', 'start', 'end', 'expiry', 'due']
+    name_lower = str(col_name).lower()
+    return any(h in name_lower for h in date_hints)
+
+
 def _is_date_column(clean: pd.Series, col_name: str) -> bool:
     """Heuristic: try parsing a sample as dates."""
     try:
@@ -118,13 +224,18 @@ def _is_date_column(clean: pd.Series, col_name: str) -> bool:
             return True
 
         # Check column name hints
-        date_hints = ['date', 'time', 'timestamp', 'created', 'updated', 'dt',
-                      'dob', 'birth', 'start', 'end', 'expiry', 'due']
-        name_lower = col_name.lower()
-        has_hint = any(h in name_lower for h in date_hints)
+        has_hint = _has_date_hint(col_name)
 
         # Try parsing a sample
         sample = clean.head(50).astype(str)
+
+        # Cheap probe first: without a name hint, 11 misses in the first 11
+        # rows already cap the ratio at 39/50 < 0.8 — skip the full parse
+        if not has_hint and len(sample) == 50:
+            probe = pd.to_datetime(sample.head(11), errors='coerce', format='mixed')
+            if probe.isna().all():
+                return False
+
         parsed = pd.to_datetime(sample, errors='coerce', format='mixed')
         parse_ratio = parsed.notna().sum() / len(sample)
 
@@ -138,34 +249,143 @@ def _is_date_column(clean: pd.Series, col_name: str) -> bool:
         return False
 
 
+def _parse_dates(series: pd.Series) -> pd.Series:
+    """
+    Full-column date parse for the Date branch (unparseable → NaT).
+    Already-datetime columns pass through; text tries the fast ISO 8601
+    parser first and only re-parses with format='mixed' if any value fails.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    if series.dtype == object or isinstance(series.dtype, pd.StringDtype):
+        dates = pd.to_datetime(series, errors='coerce', format='ISO8601')
+        if dates.isna().sum() == series.isna().sum():
+            return dates
+    return pd.to_datetime(series, errors='coerce', format='mixed')
+
+
+# ──────────────────────────────────────────────────────────────
+#  NUMERIC SUMMARY
+# ──────────────────────────────────────────────────────────────
+def describe_numeric(valid: np.ndarray) -> dict:
+    """
+    Fused summary of NaN-free float values: one sort yields unique count,
+    min/max, quartiles and median; mean/std reuse the same array.
+    Quantiles use linear interpolation (same as np.percentile / Series.quantile).
+    Small-range integer columns are counted with np.bincount instead of sorted.
+    """
+    n = len(valid)
+    if n == 0:
+        return {"count": 0, "unique": 0}
+    counted = _describe_small_ints(valid)
+    if counted is not None:
+        return counted
+
+    srt = np.sort(valid)
+    pos = (n - 1) * np.array([0.25, 0.5, 0.75])
+    lo = np.floor(pos).astype(int)
+    hi = np.minimum(lo + 1, n - 1)
+    q25, q50, q75 = (srt[lo] + (srt[hi] - srt[lo]) * (pos - lo)).tolist()
+
+    return {
+        "count":  n,
+        "unique": int(np.count_nonzero(srt[1:] != srt[:-1])) + 1,
+        "min":    float(srt[0]),
+        "max":    float(srt[-1]),
+        "mean":   float(srt.mean()),
+        "median": q50,
+        "std":    float(srt.std(ddof=1)) if n > 1 else float('nan'),
+        "q25":    q25,
+        "q75":    q75,
+    }
+
+
+def _describe_small_ints(valid: np.ndarray):
+    """
+    describe_numeric for whole numbers spanning at most INT_COUNT_MAX_RANGE
+    (and no more than the value count): one bincount sweep, then order
+    statistics read off the cumulative counts — O(N + range), no sort.
+    Returns None when the column does not qualify.
+    """
+    n = len(valid)
+    vmin, vmax = valid.min(), valid.max()
+    span = vmax - vmin
+    if not (span <= INT_COUNT_MAX_RANGE and span <= n):
+        return None
+    ints = valid.astype(np.int64)
+    if not np.array_equal(ints, valid):
+        return None
+
+    counts = np.bincount(ints - int(vmin))
+    cdf = np.cumsum(counts)
+    values = np.arange(int(vmin), int(vmax) + 1, dtype=float)
+
+    pos = (n - 1) * np.array([0.25, 0.5, 0.75])
+    lo = np.floor(pos).astype(int)
+    hi = np.minimum(lo + 1, n - 1)
+    # k-th smallest value (0-based) = first value whose cumulative count > k
+    v_lo = values[np.searchsorted(cdf, lo, side='right')]
+    v_hi = values[np.searchsorted(cdf, hi, side='right')]
+    q25, q50, q75 = (v_lo + (v_hi - v_lo) * (pos - lo)).tolist()
+
+    mean = float(counts @ values) / n
+    m2 = float(counts @ (values - mean) ** 2)
+    return {
+        "count":  n,
+        "unique": int(np.count_nonzero(counts)),
+        "min":    float(vmin),
+        "max":    float(vmax),
+        "mean":   mean,
+        "median": q50,
+        "std":    float(np.sqrt(m2 / (n - 1))) if n > 1 else float('nan'),
+        "q25":    q25,
+        "q75":    q75,
+    }
+
+
 # ──────────────────────────────────────────────────────────────
 #  CHART DATA BUILDERS
 # ──────────────────────────────────────────────────────────────
-def histogram_data(series: pd.Series, col_name: str) -> dict:
-    """Histogram bins + counts as JSON."""
+def histogram_data(clean: np.ndarray, col_name: str, quartiles: tuple) -> dict:
+    """
+    Histogram bins + counts as JSON (clean = coerced float values, no NaNs).
+    quartiles is the (q25, q75) pair already computed for the column.
+    For tall files clean is the shared row sample (see SAMPLE_THRESHOLD), so
+    the bin width never needs a percentile over more than SAMPLE_ROWS values.
+    """
     try:
-        clean = pd.to_numeric(series.dropna(), errors='coerce').dropna()
-        if clean.empty or len(clean) < 2:
+        if len(clean) < 2:
             return {}
 
-        q75, q25 = np.percentile(clean, [75, 25])
+        q25, q75 = quartiles
         iqr = q75 - q25
+        lo, hi = clean.min(), clean.max()
         if iqr > 0:
             bin_width = 2 * iqr * (len(clean) ** (-1 / 3))
-            n_bins = max(int(np.ceil((clean.max() - clean.min()) / bin_width)), 5)
+            n_bins = max(int(np.ceil((hi - lo) / bin_width)), 5)
         else:
             n_bins = min(int(np.sqrt(len(clean))), 30)
         n_bins = min(n_bins, 50)
 
-        counts, edges = np.histogram(clean, bins=n_bins)
-        labels = [f"{round(float(edges[i]),1)} – {round(float(edges[i+1]),1)}"
-                  for i in range(len(counts))]
+        ints = clean.astype(np.int64) if 1 <= hi - lo <= INT_HIST_MAX_RANGE else None
+        if ints is not None and np.array_equal(ints, clean):
+            # Small-range integers (ages, ratings…): one bincount sweep, then
+            # fold the per-value tallies into the same edges np.histogram uses
+            tally = np.bincount(ints - int(lo))
+            counts, edges = np.histogram(np.arange(int(lo), int(hi) + 1),
+                                         bins=n_bins, weights=tally)
+            counts = counts.astype(np.int64)
+        else:
+            counts, edges = np.histogram(clean, bins=n_bins)
+        edges = edges.tolist()
+        labels = [f"{round(lo, 1)} – {round(hi, 1)}"
+                  for lo, hi in zip(edges[:-1], edges[1:])]
 
         return {
             "type": "histogram",
             "title": f"Distribution of {col_name}",
             "labels": labels,
-            "values": [int(c) for c in counts],
+            "values": counts.tolist(),
             "x_label": col_name,
             "y_label": "Frequency",
         }
@@ -174,19 +394,39 @@ def histogram_data(series: pd.Series, col_name: str) -> dict:
         return {}
 
 
-def bar_chart_data(series: pd.Series, col_name: str) -> dict:
-    """Bar chart categories + counts as JSON."""
+def bar_chart_data(series: pd.Series, col_name: str, value_counts: pd.Series = None) -> dict:
+    """
+    Bar chart categories + counts as JSON.
+    value_counts (optional) = precomputed counts of the column's values
+    (from the caller, or exact whole-file counts from a streamed read).
+    """
     try:
-        clean = series.dropna().astype(str)
-        if clean.empty:
+        if value_counts is not None:
+            # Partial top-30 selection; ties keep first-seen order like a stable sort
+            value_counts = value_counts.nlargest(30)
+            labels = value_counts.index.tolist()
+            values = value_counts.to_numpy().astype(int).tolist()
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            # Count integer codes directly — no per-row string allocation
+            codes = series.cat.codes.to_numpy()
+            counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+            order = np.argsort(-counts, kind='stable')
+            order = order[counts[order] > 0][:30]  # cap at 30 categories
+            labels = series.cat.categories[order].tolist()
+            values = counts[order].tolist()
+        else:
+            # Count on native values; only the surviving labels become str
+            value_counts = series.value_counts(sort=False).nlargest(30)  # cap at 30 categories
+            labels = value_counts.index.tolist()
+            values = value_counts.tolist()
+        if not labels:
             return {}
 
-        value_counts = clean.value_counts().head(30)  # cap at 30 categories
         return {
             "type": "bar",
             "title": f"Value Counts of {col_name}",
-            "labels": value_counts.index.tolist(),
-            "values": [int(c) for c in value_counts.values],
+            "labels": [str(l) for l in labels],
+            "values": values,
             "x_label": col_name,
             "y_label": "Count",
         }
@@ -195,28 +435,34 @@ def bar_chart_data(series: pd.Series, col_name: str) -> dict:
         return {}
 
 
-def detect_outliers(series: pd.Series) -> dict:
-    """IQR-based outlier detection."""
+def detect_outliers(arr: np.ndarray, row_labels: np.ndarray, quartiles: tuple) -> dict:
+    """
+    IQR-based outlier detection (quartiles = precomputed (q25, q75)).
+    arr is the full coerced column (NaN where not numeric); row_labels its index.
+    """
     try:
-        numeric = pd.to_numeric(series, errors='coerce')
-        clean = numeric.dropna()
-        if clean.empty or len(clean) < 4:
+        finite = np.isfinite(arr)
+        if np.count_nonzero(finite) < 4:
             return {"rows": [], "total": 0}
 
-        q1 = clean.quantile(0.25)
-        q3 = clean.quantile(0.75)
+        q1, q3 = quartiles
         iqr = q3 - q1
         lower = q1 - 1.5 * iqr
         upper = q3 + 1.5 * iqr
 
-        outliers = []
-        for idx, val in numeric.items():
-            if pd.notna(val) and (val < lower or val > upper):
-                outliers.append({"row": int(idx) + 1, "value": round(float(val), 1)})
+        # Vectorised mask instead of a per-row Python loop; only the first
+        # 5 survivors are formatted, the total comes straight from the mask
+        mask = finite & ((arr < lower) | (arr > upper))
+        first = np.flatnonzero(mask)[:5]
+        # Index labels, not positions — stays correct for streamed row samples
+        idxs = row_labels[first]
+        # builtin round() on the five survivors, matching boxplot_data
+        outliers = [{"row": int(i) + 1, "value": round(float(v), 1)}
+                    for i, v in zip(idxs.tolist(), arr[first].tolist())]
 
         return {
-            "rows": outliers[:5],
-            "total": len(outliers),
+            "rows": outliers,
+            "total": int(np.count_nonzero(mask)),
             "lower_threshold": round(float(lower), 1),
             "upper_threshold": round(float(upper), 1),
         }
@@ -225,27 +471,28 @@ def detect_outliers(series: pd.Series) -> dict:
         return {"rows": [], "total": 0}
 
 
-def boxplot_data(series: pd.Series) -> dict:
-    """Five-number summary + outlier points for box plot."""
+def boxplot_data(clean: np.ndarray, quartiles: tuple, median: float) -> dict:
+    """Five-number summary + outlier points for box plot (clean = coerced float values, no NaNs)."""
     try:
-        clean = pd.to_numeric(series, errors='coerce').dropna()
-        if clean.empty or len(clean) < 4:
+        if len(clean) < 4:
             return {}
 
-        q1 = float(clean.quantile(0.25))
-        q3 = float(clean.quantile(0.75))
+        q1, q3 = quartiles
         iqr = q3 - q1
-        whisker_lo = float(clean[clean >= q1 - 1.5 * iqr].min())
-        whisker_hi = float(clean[clean <= q3 + 1.5 * iqr].max())
-        bp_outliers = clean[(clean < q1 - 1.5 * iqr) | (clean > q3 + 1.5 * iqr)]
+        # One in-fence mask serves both whiskers and the outlier points
+        in_mask = (clean >= q1 - 1.5 * iqr) & (clean <= q3 + 1.5 * iqr)
+        inside = clean[in_mask]
+        whisker_lo = float(inside.min())
+        whisker_hi = float(inside.max())
+        bp_outliers = clean[~in_mask]
 
         return {
             "min": round(whisker_lo, 1),
             "q1": round(q1, 1),
-            "median": round(float(clean.median()), 1),
+            "median": round(float(median), 1),
             "q3": round(q3, 1),
             "max": round(whisker_hi, 1),
-            "outliers": [round(float(v), 1) for v in bp_outliers.values[:50]],
+            "outliers": [round(float(v), 1) for v in bp_outliers[:50]],
         }
     except Exception as e:
         log.error(f"  boxplot_data error: {e}")
@@ -255,17 +502,90 @@ def boxplot_data(series: pd.Series) -> dict:
 # ──────────────────────────────────────────────────────────────
 #  READ FILE  (handles multi-sheet Excel)
 # ──────────────────────────────────────────────────────────────
-def read_file(filepath: str) -> tuple:
+def _open_excel(filepath: str, ext: str) -> pd.ExcelFile:
+    """
+    Open with the Rust-backed calamine engine (streaming, low memory) when
+    python-calamine is installed; otherwise fall back to openpyxl read-only.
+    """
+    try:
+        return pd.ExcelFile(filepath, engine='calamine')
+    except (ImportError, ValueError) as e:
+        log.debug(f"  calamine engine unavailable ({e}), using fallback engine")
+    if ext in ('.xlsx', '.xlsm'):
+        return pd.ExcelFile(filepath, engine='openpyxl', engine_kwargs={'read_only': True})
+    return pd.ExcelFile(filepath)
+
+
+def _read_csv_fast(filepath: str, **kwargs) -> pd.DataFrame:
+    """
+    read_csv with the multithreaded pyarrow engine; falls back to the default
+    C engine when pyarrow is not installed or rejects the file (e.g. ragged
+    rows or bytes that are invalid in the requested encoding).
+
+    pyarrow infers timestamps, dates and times that the C engine leaves as
+    text; those columns are re-read with the C engine so dtypes and values
+    match the chunked stream_csv path regardless of file size.
+    """
+    try:
+        df = pd.read_csv(filepath, engine='pyarrow', **kwargs)
+        temporal = []
+        for pos, c in enumerate(df.columns):
+            if pd.api.types.is_datetime64_any_dtype(df[c]):
+                temporal.append(pos)
+            elif df[c].dtype == object:
+                first = df[c].first_valid_index()
+                value = df[c].at[first] if first is not None else None
+                # pyarrow keeps undecodable text as raw bytes rather than raising
+                if isinstance(value, bytes):
+                    raise ValueError(f"column '{c}' is not valid text in this encoding")
+                if isinstance(value, (datetime.date, datetime.time)):
+                    temporal.append(pos)
+        if temporal:
+            text = pd.read_csv(filepath, usecols=temporal, **kwargs)
+            for i, pos in enumerate(temporal):
+                df.isetitem(pos, text.iloc[:, i])
+        return df
+    except ImportError:
+        pass
+    except Exception as e:
+        log.debug(f"  pyarrow engine failed ({e}), retrying with C engine")
+    return pd.read_csv(filepath, **kwargs)
+
+
+def _csv_encodings(filepath: str) -> list:
+    """
+    Encodings to try for a CSV, in order. The first ENCODING_PROBE_BYTES are
+    decoded up front, so a file that is not UTF-8 goes straight to the
+    single-byte codecs instead of paying for a failed full UTF-8 parse.
+    """
+    encodings = ['utf-8', 'latin-1', 'cp1252']
+    try:
+        with open(filepath, 'rb') as f:
+            head = f.read(ENCODING_PROBE_BYTES)
+        head.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the probe boundary is still UTF-8
+        if e.start < len(head) - 3:
+            log.debug(f"  Encoding probe: not UTF-8 (byte {e.start}), skipping utf-8")
+            encodings.remove('utf-8')
+    except OSError:
+        pass
+    return encodings
+
+
+def read_file(filepath: str, nrows: int = None) -> tuple:
     """
     Returns (df, sheet_info, error_msg).
     sheet_info is a list of sheet names for Excel files (empty for CSV).
+    nrows (optional) caps the rows read from an Excel sheet; large CSV/TSV
+    files are streamed by stream_csv instead.
     """
     ext = os.path.splitext(filepath)[1].lower()
     log.info(f"Reading file: {filepath} (ext={ext})")
 
     try:
         if ext in ('.xls', '.xlsx', '.xlsm'):
-            xls = pd.ExcelFile(filepath)
+            xls = _open_excel(filepath, ext)
             sheet_names = xls.sheet_names
             log.info(f"  Excel file has {len(sheet_names)} sheet(s): {sheet_names}")
 
@@ -273,14 +593,14 @@ def read_file(filepath: str) -> tuple:
                 return None, [], "Excel file contains no sheets."
 
             # Read first sheet
-            df = pd.read_excel(xls, sheet_name=sheet_names[0])
+            df = pd.read_excel(xls, sheet_name=sheet_names[0], nrows=nrows)
             log.info(f"  Using sheet '{sheet_names[0]}': {df.shape[0]} rows × {df.shape[1]} cols")
 
             if df.empty or df.shape[1] < 1:
                 # Try other sheets
                 for sname in sheet_names[1:]:
                     try:
-                        df2 = pd.read_excel(xls, sheet_name=sname)
+                        df2 = pd.read_excel(xls, sheet_name=sname, nrows=nrows)
                         if not df2.empty and df2.shape[1] >= 1:
                             log.info(f"  First sheet empty, using '{sname}': {df2.shape[0]} rows × {df2.shape[1]} cols")
                             return df2, sheet_names, None
@@ -291,15 +611,15 @@ def read_file(filepath: str) -> tuple:
             return df, sheet_names, None
 
         elif ext == '.tsv':
-            df = pd.read_csv(filepath, sep='\t')
+            df = _read_csv_fast(filepath, sep='\t')
             log.info(f"  TSV parsed: {df.shape[0]} rows × {df.shape[1]} cols")
             return df, [], None
 
         else:
             # Try CSV with different encodings
-            for enc in ['utf-8', 'latin-1', 'cp1252']:
+            for enc in _csv_encodings(filepath):
                 try:
-                    df = pd.read_csv(filepath, encoding=enc)
+                    df = _read_csv_fast(filepath, encoding=enc)
                     log.info(f"  CSV parsed (encoding={enc}): {df.shape[0]} rows × {df.shape[1]} cols")
                     return df, [], None
                 except UnicodeDecodeError:
@@ -315,16 +635,390 @@ def read_file(filepath: str) -> tuple:
         return None, [], f"Error reading file: {str(e)}"
 
 
+def should_stream(filepath: str) -> bool:
+    """Large CSV/TSV files are streamed in chunks instead of loaded whole."""
+    ext = os.path.splitext(filepath)[1].lower()
+    return ext not in ('.xls', '.xlsx', '.xlsm') and os.path.getsize(filepath) >= STREAM_MIN_BYTES
+
+
+def _new_column_summary() -> dict:
+    return {"missing": 0, "n": 0, "mean": 0.0, "m2": 0.0,
+            "min": None, "max": None, "counts": Counter()}
+
+
+def _merge_moments(summ: dict, n_b: int, mean_b: float, m2_b: float,
+                   lo: float, hi: float) -> None:
+    """Chan et al. pairwise update — numerically stable running mean/variance."""
+    n_a = summ["n"]
+    n = n_a + n_b
+    delta = mean_b - summ["mean"]
+    summ["mean"] += delta * n_b / n
+    summ["m2"] += m2_b + delta ** 2 * n_a * n_b / n
+    summ["n"] = n
+    summ["min"] = lo if summ["min"] is None else min(summ["min"], lo)
+    summ["max"] = hi if summ["max"] is None else max(summ["max"], hi)
+
+
+def _update_column_summaries(columns: dict, chunk: pd.DataFrame) -> None:
+    """
+    Merge one chunk into the running (mergeable) per-column summaries.
+    Typed numeric columns are reduced together as one 2-D block — one
+    vectorised call per statistic for the whole chunk; text columns are
+    coerced one at a time.
+    """
+    missing = chunk.isna().sum()
+    num_cols, other_cols = [], []
+    for col in chunk.columns:
+        summ = columns.setdefault(col, _new_column_summary())
+        summ["missing"] += int(missing[col])
+        if summ["counts"] is not None:
+            summ["counts"].update(chunk[col].value_counts().to_dict())
+            if len(summ["counts"]) > MAX_TRACKED_VALUES:
+                summ["counts"] = None  # identifier-like column — sample is enough
+        dt = chunk[col].dtype
+        if pd.api.types.is_numeric_dtype(dt) and not pd.api.types.is_bool_dtype(dt):
+            num_cols.append(col)
+        else:
+            other_cols.append(col)
+
+    blocks = []
+    if num_cols:
+        blocks.append((num_cols, chunk[num_cols].to_numpy(dtype=float, na_value=np.nan)))
+    for col in other_cols:
+        arr = coerce_numeric(chunk[col]).to_numpy(dtype=float, na_value=np.nan)
+        blocks.append(([col], arr[:, None]))
+
+    for cols, block in blocks:
+        valid = ~np.isnan(block)
+        n_b = valid.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_b = np.where(valid, block, 0.0).sum(axis=0) / n_b
+            m2_b = (np.where(valid, block - mean_b, 0.0) ** 2).sum(axis=0)
+        lo = np.where(valid, block, np.inf).min(axis=0)
+        hi = np.where(valid, block, -np.inf).max(axis=0)
+        for j, col in enumerate(cols):
+            if n_b[j] > 0:
+                _merge_moments(columns[col], int(n_b[j]), float(mean_b[j]), float(m2_b[j]),
+                               float(lo[j]), float(hi[j]))
+
+
+def stream_csv(filepath: str) -> tuple:
+    """
+    Read a large CSV/TSV in chunks without holding the whole file in memory.
+    Returns (sample_df, summary, error_msg).
+    sample_df is a uniform random sample of up to STREAM_SAMPLE_ROWS rows
+    (original row index kept). summary holds exact whole-file figures:
+    {"rows", "preview", "columns": {col: column summary}}.
+    """
+    ext = os.path.splitext(filepath)[1].lower()
+    sep = '\t' if ext == '.tsv' else ','
+    encodings = ['utf-8'] if ext == '.tsv' else _csv_encodings(filepath)
+    log.info(f"Streaming file: {filepath} (ext={ext}, chunk={CHUNK} rows)")
+
+    for enc in encodings:
+        try:
+            rng = np.random.default_rng(0)
+            rows, preview, columns = 0, None, {}
+            sample, keys = None, None
+            for chunk in pd.read_csv(filepath, sep=sep, encoding=enc, chunksize=CHUNK):
+                if preview is None:
+                    preview = chunk.head(5)
+                rows += len(chunk)
+                _update_column_summaries(columns, chunk)
+
+                # Bottom-k over random keys = uniform sample without replacement
+                chunk_keys = rng.random(len(chunk))
+                if sample is None:
+                    sample, keys = chunk, chunk_keys
+                else:
+                    sample = pd.concat([sample, chunk])
+                    keys = np.concatenate([keys, chunk_keys])
+                if len(sample) > STREAM_SAMPLE_ROWS:
+                    keep = np.sort(np.argpartition(keys, STREAM_SAMPLE_ROWS)[:STREAM_SAMPLE_ROWS])
+                    sample, keys = sample.iloc[keep], keys[keep]
+
+            if sample is None:
+                return pd.DataFrame(), None, None
+            log.info(f"  Streamed (encoding={enc}): {rows} rows × {sample.shape[1]} cols, "
+                     f"sample of {len(sample)} rows kept")
+            return sample, {"rows": rows, "preview": preview, "columns": columns}, None
+        except UnicodeDecodeError:
+            continue
+        except Exception as e:
+            log.warning(f"  Stream parse attempt (encoding={enc}) failed: {e}")
+            continue
+
+    return None, None, "Could not parse CSV file. Check the file encoding and format."
+
+
+# ──────────────────────────────────────────────────────────────
+#  PER-COLUMN ANALYSIS
+# ──────────────────────────────────────────────────────────────
+def _analyse_one_column(col, series: pd.Series, total_rows: int, summary: dict = None,
+                        sample_idx: np.ndarray = None) -> tuple:
+    """
+    Analyse a single column. Returns (col_entry, log_messages, values), where
+    values is the coerced float ndarray for Numerical columns (reused by the
+    correlation matrix) and None otherwise.
+    Top-level (not nested) so the "processes" backend can pickle it.
+
+    For streamed files, series is a row sample and summary is the column's
+    exact whole-file summary from stream_csv (missing, min/max/mean/std, counts).
+    For tall in-memory files, sample_idx holds the row positions the histogram
+    is binned from; every other figure uses the full column.
+    """
+    messages = []
+    try:
+        # Coerce once; every numeric helper below reuses this
+        numeric = coerce_numeric(series)
+        num_mask = numeric.notna()
+        clean_num = numeric[num_mask]
+        # Float ndarray views of the coerced column, shared by every numeric helper
+        num_arr = numeric.to_numpy(dtype=float, na_value=np.nan)
+        clean_arr = num_arr[num_mask.to_numpy()]
+        desc = None
+        value_counts = None
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            # Numeric dtype: coerced values == raw values, so the numeric NaN
+            # mask doubles as the null mask, and one fused pass serves
+            # missing, unique, stats and quartiles together
+            clean = clean_num
+            desc = describe_numeric(clean_arr)
+            missing = len(series) - desc["count"]
+            unique = desc["unique"]
+        else:
+            # One null mask shared by the missing count, classifier and charts
+            na_mask = series.isna()
+            clean = series[~na_mask]
+            missing = int(na_mask.sum())
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                unique = int(clean.nunique())
+            else:
+                # Count first: one hash pass gives the unique count for free
+                # and the bar chart's counts; only top labels become str later
+                value_counts = clean.value_counts(sort=False)
+                unique = len(value_counts)
+        category = classify_column(clean, col, total_rows, clean_num, unique, summary)
+        sample_rows = total_rows
+        # Past MAX_TRACKED_VALUES the streamed counts are dropped, so unique
+        # (and the bar chart) stay sample-based — a lower bound, flagged below
+        unique_sampled = summary is not None and summary["counts"] is None
+        if summary is not None:
+            total_rows = summary["rows"]
+            missing = summary["missing"]
+            if not unique_sampled:
+                unique = len(summary["counts"])
+        dtype = str(series.dtype)
+        quality = round((1 - missing / total_rows) * 100, 1) if total_rows > 0 else 100.0
+
+        col_entry = {
+            "name": col,
+            "category": category,
+            "dtype": dtype,
+            "unique": unique,
+            "unique_sampled": unique_sampled,
+            "quality": quality,
+            "stats": {},
+            "boxplot": {},
+            "missing": missing,
+            "chart": {},
+            "chart2": {},
+            "outliers": {"rows": [], "total": 0},
+        }
+
+        if category == "Skipped":
+            if unique_sampled:
+                col_entry["skip_reason"] = (f"High cardinality ({unique} unique of {sample_rows} sampled rows "
+                                            f"— likely an identifier)")
+            else:
+                col_entry["skip_reason"] = f"High cardinality ({unique} unique of {total_rows} rows — likely an identifier)"
+            log.info(f"  [{col}] SKIPPED: high cardinality")
+            messages.append(f"Column '{col}' skipped: high cardinality (likely ID/key)")
+            return col_entry, messages, None
+
+        if category == "Numerical":
+            if len(clean_num) > 0:
+                if desc is None:
+                    desc = describe_numeric(clean_arr)
+                # Q1/Q3 once per column, shared by box plot, histogram + outliers
+                quartiles = (desc["q25"], desc["q75"])
+                col_entry["stats"] = {
+                    k: round(desc[k], 1) for k in ("min", "max", "mean", "median", "std")
+                }
+                if summary is not None and summary["n"] > 0:
+                    # Exact whole-file figures; median stays sample-based
+                    n = summary["n"]
+                    std = np.sqrt(summary["m2"] / (n - 1)) if n > 1 else float('nan')
+                    col_entry["stats"].update({
+                        "min":  round(summary["min"], 1),
+                        "max":  round(summary["max"], 1),
+                        "mean": round(summary["mean"], 1),
+                        "std":  round(float(std), 1),
+                    })
+                col_entry["boxplot"] = boxplot_data(clean_arr, quartiles, desc["median"])
+                hist_arr = clean_arr
+                if sample_idx is not None:
+                    hist_arr = num_arr[sample_idx]
+                    hist_arr = hist_arr[~np.isnan(hist_arr)]
+                col_entry["chart"] = histogram_data(hist_arr, col, quartiles)
+                col_entry["outliers"] = detect_outliers(num_arr, numeric.index.to_numpy(), quartiles)
+            log.info(f"  [{col}] Numerical analysis complete")
+
+        elif category == "String":
+            counts = summary["counts"] if summary is not None else None
+            if counts:
+                value_counts = pd.Series(counts)  # exact whole-file counts
+            col_entry["chart"] = bar_chart_data(clean, col, value_counts)
+            log.info(f"  [{col}] String analysis complete")
+
+        elif category == "Date":
+            try:
+                dates = _parse_dates(series)
+                valid_dates = dates.dropna()
+                if len(valid_dates) > 0:
+                    col_entry["stats"] = {
+                        "min": str(valid_dates.min().strftime('%Y-%m-%d')),
+                        "max": str(valid_dates.max().strftime('%Y-%m-%d')),
+                    }
+                log.info(f"  [{col}] Date analysis complete (min={col_entry['stats'].get('min')}, max={col_entry['stats'].get('max')})")
+            except Exception as e:
+                log.error(f"  [{col}] Date parse error: {e}")
+                messages.append(f"Column '{col}': date parsing error — {e}")
+
+        return col_entry, messages, (num_arr if category == "Numerical" else None)
+
+    except Exception as e:
+        log.error(f"  [{col}] Column analysis FAILED: {e}\n{traceback.format_exc()}")
+        messages.append(f"Column '{col}' analysis failed: {e}")
+        return {
+            "name": col,
+            "category": "Error",
+            "dtype": str(series.dtype),
+            "unique": 0,
+            "quality": 0,
+            "stats": {},
+            "boxplot": {},
+            "missing": int(summary["missing"] if summary is not None else series.isna().sum()),
+            "chart": {},
+            "chart2": {},
+            "outliers": {"rows": [], "total": 0},
+            "error": str(e),
+        }, messages, None
+
+
+# ──────────────────────────────────────────────────────────────
+#  RESULT CACHE
+# ──────────────────────────────────────────────────────────────
+def _result_cache_path(filepath: str, sample_threshold: int):
+    """
+    Cache file for this upload, or None when caching is not worthwhile.
+    Keyed on a SHA-256 of the full content (uploads are re-saved, so mtime
+    changes on every upload and cannot be part of the key).
+    """
+    try:
+        size = os.path.getsize(filepath)
+        if size < CACHE_MIN_BYTES:
+            return None
+        h = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(block)
+        ext = os.path.splitext(filepath)[1].lower()
+        key = f"{h.hexdigest()}-{size}-{ext.lstrip('.')}-{sample_threshold}-v{CACHE_VERSION}"
+        return os.path.join(CACHE_DIR, f"{key}.json")
+    except Exception as e:
+        log.warning(f"  Cache key error: {e}")
+        return None
+
+
+def _load_cached_result(cache_path: str):
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        log.warning(f"  Ignoring unreadable cache entry {cache_path}: {e}")
+        return None
+
+
+def _store_cached_result(cache_path: str, result: dict) -> None:
+    """
+    Write atomically so readers never see a partial entry: each writer gets
+    its own mkstemp file (unique across processes and threads), then
+    os.replace() swaps it in. Older entries are then pruned.
+    """
+    tmp = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        os.replace(tmp, cache_path)
+    except Exception as e:
+        log.warning(f"  Could not write cache entry: {e}")
+        if tmp and os.path.exists(tmp):
+            os.remove(tmp)
+    _prune_cache()
+
+
+def _prune_cache() -> None:
+    """Keep the CACHE_MAX_ENTRIES most recently used entries (hits refresh mtime)."""
+    try:
+        entries = [e for e in os.scandir(CACHE_DIR) if e.name.endswith('.json')]
+        if len(entries) <= CACHE_MAX_ENTRIES:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        for e in entries[CACHE_MAX_ENTRIES:]:
+            os.remove(e.path)
+    except OSError as e:
+        log.warning(f"  Cache pruning failed: {e}")
+
+
 # ──────────────────────────────────────────────────────────────
 #  MAIN ANALYSIS
 # ──────────────────────────────────────────────────────────────
-def analyse_file(filepath: str) -> dict:
+def analyse_file(filepath: str, sample_threshold: int = SAMPLE_THRESHOLD) -> dict:
+    """
+    Full analysis of one uploaded file. In-memory files with more than
+    sample_threshold rows have their histograms binned from a SAMPLE_ROWS
+    random sample. Results for files >= CACHE_MIN_BYTES are cached on disk.
+    """
+    cache_path = _result_cache_path(filepath, sample_threshold)
+    if cache_path:
+        cached = _load_cached_result(cache_path)
+        if cached is not None:
+            log.info(f"CACHE HIT: {os.path.basename(filepath)} → {os.path.basename(cache_path)}")
+            try:
+                os.utime(cache_path)   # mark as recently used for _prune_cache
+            except OSError:
+                pass
+            return cached
+
+    result = _analyse_uncached(filepath, sample_threshold)
+    if cache_path and result.get("valid"):
+        _store_cached_result(cache_path, result)
+    return result
+
+
+def _analyse_uncached(filepath: str, sample_threshold: int) -> dict:
     log.info("=" * 60)
     log.info(f"ANALYSIS START: {os.path.basename(filepath)}")
     log.info("=" * 60)
 
     # ── Read file ─────────────────────────────────────────────
-    df, sheet_names, read_error = read_file(filepath)
+    # Large CSV/TSV: stream in chunks, keep exact summaries + a row sample
+    stream_summary, row_cap, truncated = None, None, False
+    if should_stream(filepath):
+        df, stream_summary, read_error = stream_csv(filepath)
+        sheet_names = []
+    else:
+        # Huge workbooks can't be streamed: read only the first EXCEL_MAX_ROWS
+        row_cap = EXCEL_MAX_ROWS if os.path.getsize(filepath) > EXCEL_NROWS_MIN_BYTES else None
+        # One extra row tells a truncated sheet apart from one of exactly row_cap rows
+        df, sheet_names, read_error = read_file(filepath, nrows=row_cap + 1 if row_cap else None)
+        if df is not None and row_cap is not None and len(df) > row_cap:
+            df, truncated = df.iloc[:row_cap], True
 
     if read_error or df is None:
         msg = read_error or "Could not read file. Please check the format."
@@ -338,38 +1032,46 @@ def analyse_file(filepath: str) -> dict:
     log.info(f"  DataFrame shape: {df.shape[0]} rows × {df.shape[1]} columns")
     log.info(f"  Columns: {df.columns.tolist()}")
 
-    # ── Data quality ──────────────────────────────────────────
-    total_cells = int(df.shape[0] * df.shape[1])
-    total_missing = int(df.isna().sum().sum())
-    overall_quality = round((1 - total_missing / total_cells) * 100, 1) if total_cells > 0 else 100.0
-    log.info(f"  Data quality: {overall_quality}% ({total_missing} missing of {total_cells} cells)")
+    n_rows = stream_summary["rows"] if stream_summary else int(df.shape[0])
+    col_summaries = [None] * df.shape[1]
+    if stream_summary:
+        col_summaries = [dict(stream_summary["columns"][c], rows=n_rows) for c in df.columns]
 
     result = {
         "valid": True,
         "message": "File analysed successfully",
-        "rows": int(df.shape[0]),
+        "rows": n_rows,
         "columns": int(df.shape[1]),
         "sheet_names": sheet_names,
         "column_names": df.columns.tolist(),
         "preview": [],
         "preview_columns": df.columns.tolist(),
-        "data_quality": {
-            "overall": overall_quality,
-            "total_cells": total_cells,
-            "total_missing": total_missing,
-        },
+        "data_quality": {},
         "correlation": {},
         "column_analysis": [],
         "log_messages": [],
+        "sampled": stream_summary is not None,
+        "sample_rows": int(df.shape[0]),
     }
 
+    if stream_summary:
+        result["log_messages"].append(
+            f"Large file: charts, quartiles, outliers and date ranges use a random "
+            f"sample of {df.shape[0]:,} of {n_rows:,} rows. Row counts, missing "
+            f"values, numeric min/max/mean/std and category counts use every row, "
+            f"except that columns with more than {MAX_TRACKED_VALUES:,} distinct "
+            f"values take their unique count and bar chart from the sample.")
+    elif truncated:
+        result["sampled"] = True
+        result["log_messages"].append(
+            f"Large workbook: only the first {row_cap:,} rows were read. "
+            f"All figures describe those rows.")
+
     # ── Preview ───────────────────────────────────────────────
     try:
-        preview_df = df.head(5).copy()
-        for c in preview_df.columns:
-            preview_df[c] = preview_df[c].apply(
-                lambda v: str(v) if pd.notna(v) else ""
-            )
+        preview_df = (stream_summary["preview"] if stream_summary else df.head(5)).astype(object)
+        # Whole-frame str cast instead of a Python lambda per cell
+        preview_df = preview_df.astype(str).where(preview_df.notna(), "")
         result["preview"] = preview_df.to_dict(orient="records")
     except Exception as e:
         log.error(f"  Preview generation error: {e}")
@@ -377,99 +1079,69 @@ def analyse_file(filepath: str) -> dict:
 
     # ── Per-column analysis ───────────────────────────────────
     total_rows = len(df)
-    for col in df.columns:
+    sample_idx = None
+    if stream_summary is None and total_rows > sample_threshold:
+        # One shared sample so every column's histogram sees the same rows
+        n_sample = min(SAMPLE_ROWS, total_rows)
+        sample_idx = np.sort(np.random.default_rng(0).choice(total_rows, n_sample, replace=False))
+        result["sampled"] = True
+        result["sample_rows"] = n_sample
+        result["log_messages"].append(
+            f"Large file: histograms are binned from a random sample of "
+            f"{n_sample:,} of {total_rows:,} rows. All other figures use every row.")
+
+    # Columns are independent, so fan them out across CPU cores. Threads share
+    # the DataFrame (NumPy/pandas kernels release the GIL); processes pay to
+    # pickle every column. Small files stay serial to avoid pool overhead.
+    cols = df.columns.tolist()
+    items = (cols, [df[c] for c in cols], [total_rows] * len(cols), col_summaries,
+             [sample_idx] * len(cols))
+    column_results = None
+    n_workers = min(os.cpu_count() or 1, len(cols))
+    if len(cols) >= PARALLEL_MIN_COLUMNS and n_workers > 1:
         try:
-            series = df[col]
-            category = classify_column(series, col, total_rows)
-            missing = int(series.isna().sum())
-            unique = int(series.nunique())
-            dtype = str(series.dtype)
-            quality = round((1 - missing / total_rows) * 100, 1) if total_rows > 0 else 100.0
-
-            col_entry = {
-                "name": col,
-                "category": category,
-                "dtype": dtype,
-                "unique": unique,
-                "quality": quality,
-                "stats": {},
-                "boxplot": {},
-                "missing": missing,
-                "chart": {},
-                "chart2": {},
-                "outliers": {"rows": [], "total": 0},
-            }
-
-            if category == "Skipped":
-                col_entry["skip_reason"] = f"High cardinality ({unique} unique of {total_rows} rows — likely an identifier)"
-                log.info(f"  [{col}] SKIPPED: high cardinality")
-                result["column_analysis"].append(col_entry)
-                result["log_messages"].append(f"Column '{col}' skipped: high cardinality (likely ID/key)")
-                continue
-
-            if category == "Numerical":
-                numeric_clean = pd.to_numeric(series, errors='coerce').dropna()
-                if len(numeric_clean) > 0:
-                    col_entry["stats"] = {
-                        "min":    round(float(numeric_clean.min()), 1),
-                        "max":    round(float(numeric_clean.max()), 1),
-                        "mean":   round(float(numeric_clean.mean()), 1),
-                        "median": round(float(numeric_clean.median()), 1),
-                        "std":    round(float(numeric_clean.std()), 1),
-                    }
-                    col_entry["boxplot"] = boxplot_data(series)
-                    col_entry["chart"] = histogram_data(series, col)
-                    col_entry["outliers"] = detect_outliers(series)
-                log.info(f"  [{col}] Numerical analysis complete")
-
-            elif category == "String":
-                col_entry["chart"] = bar_chart_data(series, col)
-                log.info(f"  [{col}] String analysis complete")
-
-            elif category == "Date":
-                try:
-                    dates = pd.to_datetime(series, errors='coerce', format='mixed')
-                    valid_dates = dates.dropna()
-                    if len(valid_dates) > 0:
-                        col_entry["stats"] = {
-                            "min": str(valid_dates.min().strftime('%Y-%m-%d')),
-                            "max": str(valid_dates.max().strftime('%Y-%m-%d')),
-                        }
-                    log.info(f"  [{col}] Date analysis complete (min={col_entry['stats'].get('min')}, max={col_entry['stats'].get('max')})")
-                except Exception as e:
-                    log.error(f"  [{col}] Date parse error: {e}")
-                    result["log_messages"].append(f"Column '{col}': date parsing error — {e}")
+            pool = ThreadPoolExecutor if PARALLEL_BACKEND == "threads" else ProcessPoolExecutor
+            with pool(max_workers=n_workers) as ex:
+                column_results = list(ex.map(_analyse_one_column, *items))
+        except Exception as e:
+            log.warning(f"  Parallel column analysis failed, falling back to serial: {e}")
+    if column_results is None:
+        column_results = [_analyse_one_column(*args) for args in zip(*items)]
 
-            result["column_analysis"].append(col_entry)
+    num_values = {}
+    for col_entry, messages, values in column_results:
+        result["column_analysis"].append(col_entry)
+        result["log_messages"].extend(messages)
+        if values is not None:
+            num_values[col_entry["name"]] = values
 
-        except Exception as e:
-            log.error(f"  [{col}] Column analysis FAILED: {e}\n{traceback.format_exc()}")
-            result["column_analysis"].append({
-                "name": col,
-                "category": "Error",
-                "dtype": str(df[col].dtype),
-                "unique": 0,
-                "quality": 0,
-                "stats": {},
-                "boxplot": {},
-                "missing": 0,
-                "chart": {},
-                "chart2": {},
-                "outliers": {"rows": [], "total": 0},
-                "error": str(e),
-            })
-            result["log_messages"].append(f"Column '{col}' analysis failed: {e}")
+    # ── Data quality ──────────────────────────────────────────
+    # Summed from the per-column missing counts — no second whole-frame isna()
+    total_cells = int(n_rows * df.shape[1])
+    total_missing = int(sum(c["missing"] for c in result["column_analysis"]))
+    overall_quality = round((1 - total_missing / total_cells) * 100, 1) if total_cells > 0 else 100.0
+    log.info(f"  Data quality: {overall_quality}% ({total_missing} missing of {total_cells} cells)")
+    result["data_quality"] = {
+        "overall": overall_quality,
+        "total_cells": total_cells,
+        "total_missing": total_missing,
+    }
 
     # ── Correlation matrix (Numerical columns only) ───────────
     try:
         num_cols = [c["name"] for c in result["column_analysis"] if c["category"] == "Numerical"]
         if len(num_cols) >= 2:
-            num_df = df[num_cols].apply(pd.to_numeric, errors='coerce')
-            corr = num_df.corr()
+            # Reuse the arrays the column workers already coerced
+            mat = np.column_stack([num_values[c] for c in num_cols])
+            if np.isfinite(mat).all():
+                # No gaps or infs: pairwise handling is moot, one BLAS-backed pass
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    corr = np.corrcoef(mat, rowvar=False)
+            else:
+                corr = pd.DataFrame(mat).corr().to_numpy()
             result["correlation"] = {
                 "columns": num_cols,
-                "matrix": [[round(float(corr.iloc[i, j]), 2) for j in range(len(num_cols))]
-                            for i in range(len(num_cols))],
+                "matrix": np.round(corr, 2).tolist(),
             }
             log.info(f"  Correlation matrix: {len(num_cols)}×{len(num_cols)}")
     except Exception as e:
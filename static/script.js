@@ -20,6 +20,17 @@
     '#0ea5e9', '#ec4899', '#10b981', '#6366f1', '#f97316',
   ];
 
+  /* Shared Chart.js theme — applied once here instead of per chart.
+     Guarded so a failed CDN load only breaks the charts, not the page. */
+  if (window.Chart) {
+    Chart.defaults.plugins.legend.display = false;
+    Object.assign(Chart.defaults.plugins.tooltip, {
+      backgroundColor: '#1a1d2e', cornerRadius: 6, padding: 10,
+      titleFont: { size: 11, family: 'JetBrains Mono', weight: 'bold' }, bodyFont: { size: 12, family: 'Outfit' },
+    });
+    Object.assign(Chart.defaults.animation, { duration: 600, easing: 'easeOutQuart' });
+  }
+
   const CATEGORY_ORDER = ['Numerical', 'String', 'Date', 'Skipped', 'Error'];
   const CATEGORY_ICONS = {
     Numerical: '🔢', String: '🔤', Date: '📅', Skipped: '⏭️', Error: '⚠️'
@@ -177,7 +188,7 @@
         if (cat === 'Skipped') {
           html += `<span class="${cls}" title="${esc(cd.skip_reason || '')}">
             <span class="col-tag-name">${esc(cd.name)}</span>
-            <span class="col-tag-meta">${esc(cd.dtype)} · ${cd.unique} uniq</span>
+            <span class="col-tag-meta">${esc(cd.dtype)} · ${uniqText(cd)} uniq</span>
           </span>`;
         } else if (cat === 'Error') {
           html += `<span class="${cls}" title="${esc(cd.error || 'Unknown error')}">
@@ -187,7 +198,7 @@
         } else {
           html += `<span class="${cls}" data-col="${esc(cd.name)}">
             <span class="col-tag-name">${esc(cd.name)}</span>
-            <span class="col-tag-meta">${esc(cd.dtype)} · ${cd.unique} uniq · <span style="color:${qCol}">${cd.quality}%</span></span>
+            <span class="col-tag-meta">${esc(cd.dtype)} · ${uniqText(cd)} uniq · <span style="color:${qCol}">${cd.quality}%</span></span>
           </span>`;
         }
       });
@@ -258,8 +269,9 @@
       ctx.fillText(trunc(cols[i], 14), labelWidth - 8, topPad + i * cellSize + cellSize / 2 + 4);
     }
 
-    // Cells
+    // Cells — font is constant for every cell label, so set it once
     ctx.textAlign = 'center'; ctx.textBaseline = 'middle';
+    ctx.font = `600 ${cellSize > 38 ? 10 : 8}px JetBrains Mono`;
     for (let i = 0; i < n; i++) {
       for (let j = 0; j < n; j++) {
         const val = matrix[i][j];
@@ -267,7 +279,6 @@
         ctx.fillStyle = corrColor(val);
         ctx.beginPath(); roundRect(ctx, x+1, y+1, cellSize-2, cellSize-2, 3); ctx.fill();
         ctx.fillStyle = Math.abs(val) > 0.6 ? '#ffffff' : '#374151';
-        ctx.font = `600 ${cellSize > 38 ? 10 : 8}px JetBrains Mono`;
         ctx.fillText(val.toFixed(2), x + cellSize / 2, y + cellSize / 2);
       }
     }
@@ -342,7 +353,7 @@
 
     // Quick chips
     html += `<div class="quick-info">
-      <span class="quick-chip">Unique values: <strong>${col.unique}</strong></span>
+      <span class="quick-chip">Unique values: <strong>${uniqText(col)}</strong></span>
       <span class="quick-chip">Missing: <strong>${col.missing}</strong></span>
     </div>`;
 
@@ -499,11 +510,10 @@
       });
       chartInstances.push(chart);
     } else if (chartData.type === 'bar') {
-      const bg = chartData.labels.map((_,i) => COLORS[i%COLORS.length]+'cc');
-      const bd = chartData.labels.map((_,i) => COLORS[i%COLORS.length]);
+      // One colour for nominal counts, matching the histogram
       const chart = new Chart(ctx, {
         type: 'bar',
-        data: { labels: chartData.labels.map(l => l.length>18 ? l.slice(0,16)+'…' : l), datasets: [{ data: chartData.values, backgroundColor: bg, borderColor: bd, borderWidth: 1, borderRadius: 4 }] },
+        data: { labels: chartData.labels.map(l => l.length>18 ? l.slice(0,16)+'…' : l), datasets: [{ data: chartData.values, backgroundColor: COLORS[0]+'cc', borderColor: COLORS[0], borderWidth: 1, borderRadius: 4 }] },
         options: chartOpts(chartData, numBars),
       });
       chartInstances.push(chart);
@@ -514,10 +524,8 @@
     return {
       responsive: true, maintainAspectRatio: true, aspectRatio: 2,
       plugins: {
-        legend: { display: false },
         title: { display: true, text: cd.title, font: { size: 14, weight: '700', family: 'Outfit' }, color: '#1a1d2e', padding: { bottom: 12 } },
-        tooltip: { backgroundColor: '#1a1d2e', titleFont: { size: 11, family: 'JetBrains Mono' }, bodyFont: { size: 12, family: 'Outfit' }, cornerRadius: 6, padding: 10,
-          callbacks: { label: (c) => `Count: ${c.parsed.y.toLocaleString()}` } },
+        tooltip: { callbacks: { label: (c) => `Count: ${c.parsed.y.toLocaleString()}` } },
       },
       scales: {
         x: { title: { display: true, text: cd.x_label, font: { size: 11, weight: '600', family: 'Outfit' }, color: '#6c7389' },
@@ -525,9 +533,11 @@
         y: { title: { display: true, text: cd.y_label, font: { size: 11, weight: '600', family: 'Outfit' }, color: '#6c7389' },
              ticks: { font: { size: 9, family: 'JetBrains Mono' }, color: '#6c7389', precision: 0 }, grid: { color: '#f3f4f6', drawBorder: false }, beginAtZero: true },
       },
-      animation: { duration: 600, easing: 'easeOutQuart' },
     };
   }
 
+  /* Sample-based unique counts (streamed, >10k distinct) are lower bounds */
+  function uniqText(cd) { return cd.unique_sampled ? `${cd.unique}+` : `${cd.unique}`; }
+
   function esc(str) { const d = document.createElement('div'); d.textContent = str; return d.innerHTML; }
 })();